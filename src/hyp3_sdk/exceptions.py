@@ -1,7 +1,12 @@
 """Errors and exceptions to raise when the SDK runs into problems"""
 
+from typing import TYPE_CHECKING
+
 from requests import Response
-from requests.exceptions import HTTPError
+
+
+if TYPE_CHECKING:
+    from hyp3_sdk.jobs import Batch
 
 
 class HyP3SDKError(Exception):
@@ -12,6 +17,17 @@ class HyP3Error(HyP3SDKError):
     """Raise for errors when using the HyP3 module"""
 
 
+class PartialSubmissionError(HyP3Error):
+    """Raise when HyP3 rejects a chunk of jobs after earlier chunks were already submitted
+
+    The jobs that were submitted are available as the `batch` attribute.
+    """
+
+    def __init__(self, message: str, batch: 'Batch'):
+        super().__init__(message)
+        self.batch = batch
+
+
 class ASFSearchError(HyP3SDKError):
     """Raise for errors when using the ASF Search module"""
 
@@ -25,18 +41,24 @@ class AuthenticationError(HyP3SDKError):
 
 
 def _raise_for_hyp3_status(response: Response):
-    try:
-        response.raise_for_status()
-    except HTTPError:
-        if 400 <= response.status_code < 500:
-            raise HyP3Error(f'{response} {response.json()["detail"]}')
-        raise ServerError
+    if response.status_code < 400:
+        return
+    if response.status_code < 500:
+        try:
+            detail = response.json()['detail']
+        except (ValueError, KeyError, TypeError):
+            detail = response.text
+        raise HyP3Error(f'{response} {detail}')
+    raise ServerError
 
 
 def _raise_for_search_status(response: Response):
-    try:
-        response.raise_for_status()
-    except HTTPError:
-        if 400 <= response.status_code < 500:
-            raise ASFSearchError(f'{response} {response.json()["error"]["report"]}')
-        raise ServerError
+    if response.status_code < 400:
+        return
+    if response.status_code < 500:
+        try:
+            report = response.json()['error']['report']
+        except (ValueError, KeyError, TypeError):
+            report = response.text
+        raise ASFSearchError(f'{response} {report}')
+    raise ServerError
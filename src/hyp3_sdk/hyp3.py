@@ -1,16 +1,18 @@
-import math
+import random
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from functools import singledispatchmethod
 from getpass import getpass
 from typing import Literal
 from urllib.parse import urljoin
 from warnings import warn
 
+import requests
+
 import hyp3_sdk
 import hyp3_sdk.util
-from hyp3_sdk.exceptions import HyP3Error, _raise_for_hyp3_status
+from hyp3_sdk.exceptions import HyP3Error, HyP3SDKError, PartialSubmissionError, _raise_for_hyp3_status
 from hyp3_sdk.jobs import Batch, Job
 
 
@@ -18,6 +20,18 @@ PROD_API = 'https://hyp3-api.asf.alaska.edu'
 TEST_API = 'https://hyp3-test-api.asf.alaska.edu'
 
 
+def _next_interval(delay: int | float, max_interval: int | float) -> int | float:
+    """Grow a polling interval by 50%, without exceeding `max_interval`"""
+    return max(delay, min(delay * 1.5, max_interval))
+
+
+def _format_datetime(dt: datetime) -> str:
+    """Format a datetime as an ISO 8601 string for the HyP3 API, treating naive datetimes as UTC"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.isoformat(timespec='seconds')
+
+
 class HyP3:
     """A python wrapper around the HyP3 API.
 
@@ -43,6 +57,7 @@ class HyP3:
             prompt: Prompt for username and/or password interactively when they
                 are not provided as keyword parameters
         """
+        self._user_info: tuple[float, dict] | None = None
         self.url = api_url
 
         if username is None and prompt:
@@ -53,6 +68,20 @@ class HyP3:
         self.session = hyp3_sdk.util.get_authenticated_session(username, password)
         self.session.headers.update({'User-Agent': f'{hyp3_sdk.__name__}/{hyp3_sdk.__version__}'})
 
+    @property
+    def url(self) -> str:
+        """Address of the HyP3 API"""
+        return self._url
+
+    @url.setter
+    def url(self, api_url: str):
+        self._url = api_url
+        self._jobs_url = urljoin(api_url, '/jobs')
+        self._user_url = urljoin(api_url, '/user')
+        self._costs_url = urljoin(api_url, '/costs')
+        # cached user information belongs to the previous API
+        self._user_info = None
+
     def find_jobs(
         self,
         start: datetime | None = None,
@@ -76,25 +105,29 @@ class HyP3:
             A Batch object containing the found jobs
         """
         params = {}
-        for param_name in ('start', 'end', 'status_code', 'name', 'job_type', 'user_id'):
-            param_value = locals().get(param_name)
-            if param_value is not None:
-                if isinstance(param_value, datetime):
-                    if param_value.tzinfo is None:
-                        param_value = param_value.replace(tzinfo=timezone.utc)
-                    param_value = param_value.isoformat(timespec='seconds')
-
-                params[param_name] = param_value
+        if start is not None:
+            params['start'] = _format_datetime(start)
+        if end is not None:
+            params['end'] = _format_datetime(end)
+        if status_code is not None:
+            params['status_code'] = status_code
+        if name is not None:
+            params['name'] = name
+        if job_type is not None:
+            params['job_type'] = job_type
+        if user_id is not None:
+            params['user_id'] = user_id
 
-        response = self.session.get(urljoin(self.url, '/jobs'), params=params)
+        response = self.session.get(self._jobs_url, params=params)
         _raise_for_hyp3_status(response)
-        jobs = [Job.from_dict(job) for job in response.json()['jobs']]
+        page = hyp3_sdk.util._load_json(response)
+        jobs = [Job.from_dict(job) for job in page['jobs']]
 
-        while 'next' in response.json():
-            next_url = response.json()['next']
-            response = self.session.get(next_url)
+        while 'next' in page:
+            response = self.session.get(page['next'])
             _raise_for_hyp3_status(response)
-            jobs.extend([Job.from_dict(job) for job in response.json()['jobs']])
+            page = hyp3_sdk.util._load_json(response)
+            jobs.extend([Job.from_dict(job) for job in page['jobs']])
 
         return Batch(jobs)
 
@@ -107,64 +140,112 @@ class HyP3:
         Returns:
             A Job object
         """
-        response = self.session.get(urljoin(self.url, f'/jobs/{job_id}'))
+        response = self.session.get(f'{self._jobs_url}/{job_id}')
         _raise_for_hyp3_status(response)
 
-        return Job.from_dict(response.json())
+        return Job.from_dict(hyp3_sdk.util._load_json(response))
 
-    @singledispatchmethod
-    def watch(self, job_or_batch: Batch | Job, timeout: int = 10800, interval: int | float = 60) -> Batch | Job:
+    def watch(
+        self,
+        job_or_batch: Batch | Job,
+        timeout: int = 10800,
+        interval: int | float = 60,
+        max_interval: int | float | None = None,
+        jitter: bool = False,
+    ) -> Batch | Job:
         """Watch jobs until they complete
 
         Args:
             job_or_batch: A Batch or Job object of jobs to watch
             timeout: How long to wait until exiting in seconds
             interval: How often to check for updates in seconds
+            max_interval: If greater than `interval`, the time between checks grows by 50% each time
+                no additional jobs have completed, up to `max_interval` seconds, and returns to
+                `interval` as soon as more jobs complete
+            jitter: Randomize each wait between 50% and 150% of its length, so that many
+                concurrent watchers do not check HyP3 in lockstep
 
         Returns:
             A Batch or Job object with refreshed watched jobs
         """
+        if isinstance(job_or_batch, Batch):
+            return self._watch_batch(job_or_batch, timeout, interval, max_interval, jitter)
+        if isinstance(job_or_batch, Job):
+            return self._watch_job(job_or_batch, timeout, interval, max_interval, jitter)
         raise NotImplementedError(f'Cannot watch {type(job_or_batch)} type object')
 
-    @watch.register
-    def _watch_batch(self, batch: Batch, timeout: int = 10800, interval: int | float = 60) -> Batch:
+    def _watch_batch(
+        self,
+        batch: Batch,
+        timeout: int = 10800,
+        interval: int | float = 60,
+        max_interval: int | float | None = None,
+        jitter: bool = False,
+    ) -> Batch:
         tqdm = hyp3_sdk.util.get_tqdm_progress_bar()
-        iterations_until_timeout = math.ceil(timeout / interval)
+        deadline = time.monotonic() + timeout
+        delay = interval
+        previously_complete = 0
         bar_format = '{l_bar}{bar}| {n_fmt}/{total_fmt} [{postfix[0]}]'
+        # the first check refreshes every job; after that, complete jobs can no longer change status,
+        # so only the incomplete jobs need to be refreshed
+        refresh = self._refresh_batch
         with tqdm(total=len(batch), bar_format=bar_format, postfix=[f'timeout in {timeout} s']) as progress_bar:
-            for ii in range(iterations_until_timeout):
-                batch = self.refresh(batch)  # type: ignore [assignment]
+            while time.monotonic() < deadline:
+                batch = refresh(batch)
+                refresh = self._refresh_incomplete
 
                 counts = batch._count_statuses()
                 complete = counts['SUCCEEDED'] + counts['FAILED']
 
-                progress_bar.postfix = [f'timeout in {timeout - ii * interval}s']
+                progress_bar.postfix = [f'timeout in {round(deadline - time.monotonic())}s']
                 # to control n/total manually; update is n += value
                 progress_bar.n = complete
                 progress_bar.update(0)
 
                 if batch.complete():
                     return batch
-                time.sleep(interval)
+
+                if complete > previously_complete:
+                    delay = interval
+                previously_complete = complete
+
+                time.sleep(delay * random.uniform(0.5, 1.5) if jitter else delay)
+                if max_interval is not None:
+                    delay = _next_interval(delay, max_interval)
         raise HyP3Error(f'Timeout occurred while waiting for {batch}')
 
-    @watch.register
-    def _watch_job(self, job: Job, timeout: int = 10800, interval: int | float = 60) -> Job:
+    def _watch_job(
+        self,
+        job: Job,
+        timeout: int = 10800,
+        interval: int | float = 60,
+        max_interval: int | float | None = None,
+        jitter: bool = False,
+    ) -> Job:
         tqdm = hyp3_sdk.util.get_tqdm_progress_bar()
-        iterations_until_timeout = math.ceil(timeout / interval)
+        deadline = time.monotonic() + timeout
+        delay = interval
         bar_format = '{n_fmt}/{total_fmt} [{postfix[0]}]'
         with tqdm(total=1, bar_format=bar_format, postfix=[f'timeout in {timeout} s']) as progress_bar:
-            for ii in range(iterations_until_timeout):
-                job = self.refresh(job)  # type: ignore [assignment]
-                progress_bar.postfix = [f'timeout in {timeout - ii * interval}s']
+            while time.monotonic() < deadline:
+                job = self._refresh_job(job)
+                progress_bar.postfix = [f'timeout in {round(deadline - time.monotonic())}s']
                 progress_bar.update(int(job.complete()))
 
                 if job.complete():
                     return job
-                time.sleep(interval)
+
+                time.sleep(delay * random.uniform(0.5, 1.5) if jitter else delay)
+                if max_interval is not None:
+                    delay = _next_interval(delay, max_interval)
         raise HyP3Error(f'Timeout occurred while waiting for {job}')
 
-    @singledispatchmethod
+    def _refresh_incomplete(self, batch: Batch) -> Batch:
+        incomplete_jobs = Batch([job for job in batch if not job.complete()])
+        refreshed_jobs = iter(self._refresh_batch(incomplete_jobs))
+        return Batch([job if job.complete() else next(refreshed_jobs) for job in batch])
+
     def refresh(self, job_or_batch: Batch | Job) -> Batch | Job:
         """Refresh each jobs' information
 
@@ -174,40 +255,60 @@ class HyP3:
         Returns:
             A Batch or Job object with refreshed information
         """
+        if isinstance(job_or_batch, Batch):
+            return self._refresh_batch(job_or_batch)
+        if isinstance(job_or_batch, Job):
+            return self._refresh_job(job_or_batch)
         raise NotImplementedError(f'Cannot refresh {type(job_or_batch)} type object')
 
-    @refresh.register
-    def _refresh_batch(self, batch: Batch):
-        jobs = []
-        for job in batch.jobs:
-            jobs.append(self.refresh(job))
-        return Batch(jobs)  # type: ignore [arg-type]
+    def _refresh_batch(self, batch: Batch) -> Batch:
+        # a batch may contain the same job more than once, but each job only needs to be fetched once
+        job_ids = list(dict.fromkeys(job.job_id for job in batch))
+        with ThreadPoolExecutor(max_workers=hyp3_sdk.util._API_POOL_SIZE) as executor:
+            refreshed_jobs = dict(zip(job_ids, executor.map(self.get_job_by_id, job_ids)))
+        return Batch([refreshed_jobs[job.job_id] for job in batch])
 
-    @refresh.register
-    def _refresh_job(self, job: Job):
+    def _refresh_job(self, job: Job) -> Job:
         return self.get_job_by_id(job.job_id)
 
     def submit_prepared_jobs(self, prepared_jobs: dict | list[dict]) -> Batch:
         """Submit a prepared job dictionary, or list of prepared job dictionaries
 
+        Jobs are submitted in chunks of at most 200 jobs per request, the most HyP3 accepts at once.
+        Each chunk is accepted or rejected by HyP3 on its own.
+
         Args:
             prepared_jobs: A prepared job dictionary, or list of prepared job dictionaries
 
         Returns:
             A Batch object containing the submitted job(s)
+
+        Raises:
+            PartialSubmissionError: If a chunk is rejected, or its request fails, after earlier chunks were
+                submitted. The submitted jobs are available as its `batch` attribute.
         """
         if isinstance(prepared_jobs, dict):
-            payload = {'jobs': [prepared_jobs]}
-        else:
-            payload = {'jobs': prepared_jobs}
-
-        response = self.session.post(urljoin(self.url, '/jobs'), json=payload)
-        _raise_for_hyp3_status(response)
-
-        batch = Batch()
-        for job in response.json()['jobs']:
-            batch += Job.from_dict(job)
-        return batch
+            prepared_jobs = [prepared_jobs]
+
+        submitted_jobs: list[Job] = []
+        try:
+            for jobs in hyp3_sdk.util.chunk(prepared_jobs):
+                try:
+                    response = self.session.post(self._jobs_url, json={'jobs': jobs})
+                    _raise_for_hyp3_status(response)
+                except (HyP3SDKError, requests.RequestException) as e:
+                    if not submitted_jobs:
+                        raise
+                    raise PartialSubmissionError(
+                        f'{e} Only {len(submitted_jobs)} of {len(prepared_jobs)} jobs '
+                        'are known to have been submitted.',
+                        Batch(submitted_jobs),
+                    ) from e
+                submitted_jobs.extend([Job.from_dict(job) for job in hyp3_sdk.util._load_json(response)['jobs']])
+        finally:
+            # remaining credits have changed
+            self._user_info = None
+        return Batch(submitted_jobs)
 
     def submit_autorift_job(self, granule1: str, granule2: str, name: str | None = None) -> Batch:
         """Submit an autoRIFT job
@@ -280,9 +381,20 @@ class HyP3:
         Returns:
             A Batch object containing the RTC job
         """
-        arguments = locals()
-        arguments.pop('self')
-        job_dict = self.prepare_rtc_job(**arguments)
+        job_dict = self.prepare_rtc_job(
+            granule,
+            name=name,
+            dem_matching=dem_matching,
+            include_dem=include_dem,
+            include_inc_map=include_inc_map,
+            include_rgb=include_rgb,
+            include_scattering_area=include_scattering_area,
+            radiometry=radiometry,
+            resolution=resolution,
+            scale=scale,
+            speckle_filter=speckle_filter,
+            dem_name=dem_name,
+        )
         return self.submit_prepared_jobs(prepared_jobs=job_dict)
 
     @classmethod
@@ -323,12 +435,20 @@ class HyP3:
         Returns:
             A dictionary containing the prepared RTC job
         """
-        job_parameters = locals().copy()
-        for key in ['granule', 'name', 'cls']:
-            job_parameters.pop(key, None)
-
         job_dict = {
-            'job_parameters': {'granules': [granule], **job_parameters},
+            'job_parameters': {
+                'granules': [granule],
+                'dem_matching': dem_matching,
+                'include_dem': include_dem,
+                'include_inc_map': include_inc_map,
+                'include_rgb': include_rgb,
+                'include_scattering_area': include_scattering_area,
+                'radiometry': radiometry,
+                'resolution': resolution,
+                'scale': scale,
+                'speckle_filter': speckle_filter,
+                'dem_name': dem_name,
+            },
             'job_type': 'RTC_GAMMA',
         }
 
@@ -376,9 +496,20 @@ class HyP3:
         Returns:
             A Batch object containing the InSAR job
         """
-        arguments = locals().copy()
-        arguments.pop('self')
-        job_dict = self.prepare_insar_job(**arguments)
+        job_dict = self.prepare_insar_job(
+            granule1,
+            granule2,
+            name=name,
+            include_look_vectors=include_look_vectors,
+            include_los_displacement=include_los_displacement,
+            include_inc_map=include_inc_map,
+            looks=looks,
+            include_dem=include_dem,
+            include_wrapped_phase=include_wrapped_phase,
+            apply_water_mask=apply_water_mask,
+            include_displacement_maps=include_displacement_maps,
+            phase_filter_parameter=phase_filter_parameter,
+        )
         return self.submit_prepared_jobs(prepared_jobs=job_dict)
 
     @classmethod
@@ -429,12 +560,19 @@ class HyP3:
                 FutureWarning,
             )
 
-        job_parameters = locals().copy()
-        for key in ['cls', 'granule1', 'granule2', 'name']:
-            job_parameters.pop(key)
-
         job_dict = {
-            'job_parameters': {'granules': [granule1, granule2], **job_parameters},
+            'job_parameters': {
+                'granules': [granule1, granule2],
+                'include_look_vectors': include_look_vectors,
+                'include_los_displacement': include_los_displacement,
+                'include_inc_map': include_inc_map,
+                'looks': looks,
+                'include_dem': include_dem,
+                'include_wrapped_phase': include_wrapped_phase,
+                'apply_water_mask': apply_water_mask,
+                'include_displacement_maps': include_displacement_maps,
+                'phase_filter_parameter': phase_filter_parameter,
+            },
             'job_type': 'INSAR_GAMMA',
         }
         if name is not None:
@@ -462,9 +600,9 @@ class HyP3:
         Returns:
             A Batch object containing the InSAR ISCE burst job
         """
-        arguments = locals().copy()
-        arguments.pop('self')
-        job_dict = self.prepare_insar_isce_burst_job(**arguments)
+        job_dict = self.prepare_insar_isce_burst_job(
+            granule1, granule2, name=name, apply_water_mask=apply_water_mask, looks=looks
+        )
         return self.submit_prepared_jobs(prepared_jobs=job_dict)
 
     @classmethod
@@ -489,36 +627,56 @@ class HyP3:
         Returns:
             A dictionary containing the prepared InSAR ISCE burst job
         """
-        job_parameters = locals().copy()
-        for key in ['cls', 'granule1', 'granule2', 'name']:
-            job_parameters.pop(key)
-
         job_dict = {
-            'job_parameters': {'granules': [granule1, granule2], **job_parameters},
+            'job_parameters': {
+                'granules': [granule1, granule2],
+                'apply_water_mask': apply_water_mask,
+                'looks': looks,
+            },
             'job_type': 'INSAR_ISCE_BURST',
         }
         if name is not None:
             job_dict['name'] = name
         return job_dict
 
-    def my_info(self) -> dict:
-        """Returns:
-        Your user information
+    def my_info(self, ttl: int | float = 0) -> dict:
+        """Get your user information
+
+        Args:
+            ttl: Reuse the user information from a previous call if it was retrieved less than `ttl` seconds ago
+
+        Returns:
+            Your user information
         """
-        response = self.session.get(urljoin(self.url, '/user'))
+        if self._user_info is not None:
+            retrieved_at, info = self._user_info
+            if time.monotonic() - retrieved_at < ttl:
+                return info
+
+        response = self.session.get(self._user_url)
         _raise_for_hyp3_status(response)
-        return response.json()
+        info = hyp3_sdk.util._load_json(response)
+        self._user_info = (time.monotonic(), info)
+        return info
 
-    def check_credits(self) -> float | int | None:
-        """Returns:
-        Your remaining processing credits, or None if you have no processing limit
+    def check_credits(self, ttl: int | float = 0) -> float | int | None:
+        """Check your remaining processing credits
+
+        Args:
+            ttl: Reuse the user information from a previous call if it was retrieved less than `ttl` seconds ago
+
+        Returns:
+            Your remaining processing credits, or None if you have no processing limit
         """
-        info = self.my_info()
+        info = self.my_info(ttl=ttl)
         return info['remaining_credits']
 
-    def check_quota(self) -> float | int | None:
+    def check_quota(self, ttl: int | float = 0) -> float | int | None:
         """Deprecated method for checking your remaining processing credits; replaced by `HyP3.check_credits`
 
+        Args:
+            ttl: Reuse the user information from a previous call if it was retrieved less than `ttl` seconds ago
+
         Returns:
             Your remaining processing credits, or None if you have no processing limit
         """
@@ -528,12 +686,12 @@ class HyP3:
             DeprecationWarning,
             stacklevel=2,
         )
-        return self.check_credits()
+        return self.check_credits(ttl=ttl)
 
     def costs(self) -> dict:
         """Returns:
         Table of job costs
         """
-        response = self.session.get(urljoin(self.url, '/costs'))
+        response = self.session.get(self._costs_url)
         _raise_for_hyp3_status(response)
-        return response.json()
+        return hyp3_sdk.util._load_json(response)
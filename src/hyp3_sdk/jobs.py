@@ -1,54 +1,50 @@
 from collections import Counter
-from datetime import datetime
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Union
 
-from dateutil import tz
-from dateutil.parser import parse as parse_date
 from requests import HTTPError
 
 from hyp3_sdk.exceptions import HyP3SDKError
-from hyp3_sdk.util import download_file, get_tqdm_progress_bar
+from hyp3_sdk.util import _DOWNLOAD_POOL_SIZE, download_file, get_tqdm_progress_bar
 
 
-# TODO: actually looks like a good candidate for a dataclass (python 3.7+)
-#       https://docs.python.org/3/library/dataclasses.html
+_COMPLETE_STATUS_CODES = frozenset({'SUCCEEDED', 'FAILED'})
+
+
+def _parse_datetime(value: str) -> datetime:
+    # HyP3 returns ISO 8601 timestamps, which fromisoformat parses much faster than dateutil
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        from dateutil.parser import parse as parse_date
+
+        return parse_date(value)
+
+
+@dataclass
 class Job:
-    _attributes_for_resubmit = {'name', 'job_parameters', 'job_type'}
+    job_type: str
+    job_id: str
+    request_time: datetime
+    status_code: str
+    user_id: str
+    name: str | None = None
+    job_parameters: dict | None = None
+    files: list | None = None
+    logs: list | None = None
+    browse_images: list | None = None
+    thumbnail_images: list | None = None
+    expiration_time: datetime | None = None
+    processing_times: list[float] | None = None
+    credit_cost: float | None = None
+    priority: int | None = None
 
-    def __init__(
-        self,
-        job_type: str,
-        job_id: str,
-        request_time: datetime,
-        status_code: str,
-        user_id: str,
-        name: str | None = None,
-        job_parameters: dict | None = None,
-        files: list | None = None,
-        logs: list | None = None,
-        browse_images: list | None = None,
-        thumbnail_images: list | None = None,
-        expiration_time: datetime | None = None,
-        processing_times: list[float] | None = None,
-        credit_cost: float | None = None,
-        priority: int | None = None,
-    ):
-        self.job_id = job_id
-        self.job_type = job_type
-        self.request_time = request_time
-        self.status_code = status_code
-        self.user_id = user_id
-        self.name = name
-        self.job_parameters = job_parameters
-        self.files = files
-        self.logs = logs
-        self.browse_images = browse_images
-        self.thumbnail_images = thumbnail_images
-        self.expiration_time = expiration_time
-        self.processing_times = processing_times
-        self.credit_cost = credit_cost
-        self.priority = priority
+    _attributes_for_resubmit = {'name', 'job_parameters', 'job_type'}
+    _datetime_attributes = {'request_time', 'expiration_time'}
 
     def __repr__(self):
         return f'Job.from_dict({self.to_dict()})'
@@ -56,16 +52,13 @@ class Job:
     def __str__(self):
         return f'HyP3 {self.job_type} job {self.job_id}'
 
-    def __eq__(self, other):
-        return self.__dict__ == other.__dict__
-
     @staticmethod
     def from_dict(input_dict: dict):
-        expiration_time = parse_date(input_dict['expiration_time']) if input_dict.get('expiration_time') else None
+        expiration_time = _parse_datetime(input_dict['expiration_time']) if input_dict.get('expiration_time') else None
         return Job(
             job_type=input_dict['job_type'],
             job_id=input_dict['job_id'],
-            request_time=parse_date(input_dict['request_time']),
+            request_time=_parse_datetime(input_dict['request_time']),
             status_code=input_dict['status_code'],
             user_id=input_dict['user_id'],
             name=input_dict.get('name'),
@@ -82,15 +75,12 @@ class Job:
 
     def to_dict(self, for_resubmit: bool = False):
         job_dict = {}
-        if for_resubmit:
-            keys_to_process = Job._attributes_for_resubmit
-        else:
-            keys_to_process = set(vars(self).keys())
+        keys_to_process: Iterable[str] = Job._attributes_for_resubmit if for_resubmit else vars(self)
 
         for key in keys_to_process:
-            value = self.__getattribute__(key)
+            value = getattr(self, key)
             if value is not None:
-                if isinstance(value, datetime):
+                if key in Job._datetime_attributes:
                     job_dict[key] = value.isoformat(timespec='seconds')
                 else:
                     job_dict[key] = value
@@ -104,7 +94,7 @@ class Job:
         return self.status_code == 'FAILED'
 
     def complete(self) -> bool:
-        return self.succeeded() or self.failed()
+        return self.status_code in _COMPLETE_STATUS_CODES
 
     def pending(self) -> bool:
         return self.status_code == 'PENDING'
@@ -113,12 +103,13 @@ class Job:
         return self.status_code == 'RUNNING'
 
     def expired(self) -> bool:
-        return self.expiration_time is not None and datetime.now(tz.UTC) >= self.expiration_time
+        return self.expiration_time is not None and datetime.now(timezone.utc) >= self.expiration_time
 
-    def download_files(self, location: Path | str = '.', create: bool = True) -> list[Path]:
+    def download_files(self, location: Path | str = '.', create: bool = True, show_progress: bool = True) -> list[Path]:
         """Args:
             location: Directory location to put files into
             create: Create `location` if it does not point to an existing directory
+            show_progress: Display a progress bar for each file
 
         Returns: list of Path objects to downloaded files
         """
@@ -144,7 +135,7 @@ class Job:
             download_url = file['url']
             filename = location / file['filename']
             try:
-                downloaded_files.append(download_file(download_url, filename, chunk_size=10485760))
+                downloaded_files.append(download_file(download_url, filename, show_progress=show_progress))
             except HTTPError:
                 raise HyP3SDKError(f'Unable to download file: {download_url}')
         return downloaded_files
@@ -201,7 +192,7 @@ class Batch:
         return self
 
     def __repr__(self):
-        reprs = ', '.join([job.__repr__() for job in self.jobs])
+        reprs = ', '.join(map(repr, self.jobs))
         return f'Batch([{reprs}])'
 
     def __str__(self):
@@ -215,47 +206,52 @@ class Batch:
         )
 
     def _count_statuses(self):
-        return Counter([job.status_code for job in self.jobs])
+        return Counter(job.status_code for job in self.jobs)
 
     def complete(self) -> bool:
         """Returns: True if all jobs are complete, otherwise returns False"""
-        for job in self.jobs:
-            if not job.complete():
-                return False
-        return True
+        return all(job.status_code in _COMPLETE_STATUS_CODES for job in self.jobs)
 
     def succeeded(self) -> bool:
         """Returns: True if all jobs have succeeded, otherwise returns False"""
-        for job in self.jobs:
-            if not job.succeeded():
-                return False
-        return True
+        return all(job.succeeded() for job in self.jobs)
 
-    def download_files(self, location: Path | str = '.', create: bool = True) -> list[Path]:
+    def download_files(self, location: Path | str = '.', create: bool = True, max_workers: int = 8) -> list[Path]:
         """Args:
             location: Directory location to put files into
             create: Create `location` if it does not point to an existing directory
+            max_workers: Maximum number of jobs to download concurrently, at most 16.
+                Progress bars for individual files are only displayed when `max_workers` is 1.
 
         Returns: list of Path objects to downloaded files
         """
-        downloaded_files = []
-        tqdm = get_tqdm_progress_bar()
-        for job in tqdm(self.jobs):
+        # more workers than pooled connections would open and discard extra connections
+        max_workers = min(max_workers, _DOWNLOAD_POOL_SIZE)
+
+        location = Path(location)
+        if create:
+            location.mkdir(parents=True, exist_ok=True)
+        elif not location.is_dir():
+            raise NotADirectoryError(str(location))
+
+        def download_job_files(job: Job) -> list[Path]:
             try:
-                downloaded_files.extend(job.download_files(location, create))
+                return job.download_files(location, create=False, show_progress=max_workers == 1)
             except HyP3SDKError as e:
                 print(f'Warning: {e} Skipping download for {job}.')
+                return []
+
+        downloaded_files = []
+        tqdm = get_tqdm_progress_bar()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for job_files in tqdm(executor.map(download_job_files, self.jobs), total=len(self.jobs)):
+                downloaded_files.extend(job_files)
         return downloaded_files
 
     def any_expired(self) -> bool:
         """Check succeeded jobs for expiration"""
-        for job in self.jobs:
-            try:
-                if job.expired():
-                    return True
-            except HyP3SDKError:
-                continue
-        return False
+        now = datetime.now(timezone.utc)
+        return any(job.expiration_time is not None and now >= job.expiration_time for job in self.jobs)
 
     def filter_jobs(
         self,
@@ -279,21 +275,15 @@ class Batch:
         Returns:
              batch: A batch object containing jobs matching all the selected statuses
         """
+        include_status = {'SUCCEEDED': succeeded, 'PENDING': pending, 'RUNNING': running, 'FAILED': failed}
         filtered_jobs = []
 
         for job in self.jobs:
-            if job.succeeded() and succeeded:
-                if include_expired or not job.expired():
-                    filtered_jobs.append(job)
-
-            elif job.running() and running:
-                filtered_jobs.append(job)
-
-            elif job.pending() and pending:
-                filtered_jobs.append(job)
-
-            elif job.failed() and failed:
-                filtered_jobs.append(job)
+            if not include_status.get(job.status_code, False):
+                continue
+            if job.succeeded() and not include_expired and job.expired():
+                continue
+            filtered_jobs.append(job)
 
         return Batch(filtered_jobs)
 
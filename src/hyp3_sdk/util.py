@@ -2,6 +2,7 @@
 
 import urllib.parse
 from collections.abc import Generator, Sequence
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from zipfile import ZipFile
@@ -13,6 +14,11 @@ from urllib3.util.retry import Retry
 from hyp3_sdk.exceptions import AuthenticationError
 
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json  # type: ignore[no-redef]
+
 AUTH_URL = (
     'https://urs.earthdata.nasa.gov/oauth/authorize?response_type=code&client_id=BO_n7nTIlMljdvU6kRRB3g'
     '&redirect_uri=https://auth.asf.alaska.edu/login&app_type=401'
@@ -20,6 +26,12 @@ AUTH_URL = (
 
 PROFILE_URL = 'https://urs.earthdata.nasa.gov/profile'
 
+# maximum number of connections kept open to the HyP3 API, and so the most useful number of concurrent requests
+_API_POOL_SIZE = 16
+
+# maximum number of connections kept open to a download host, and so the most useful number of concurrent downloads
+_DOWNLOAD_POOL_SIZE = 16
+
 
 def extract_zipped_product(zip_file: str | Path, delete: bool = True) -> Path:
     """Extract a zipped HyP3 product
@@ -61,6 +73,12 @@ def chunk(itr: Sequence[Any], n: int = 200) -> Generator[Sequence[Any], None, No
         yield itr[i : i + n]
 
 
+def _load_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using `orjson` when it is installed"""
+    return _json.loads(response.content)
+
+
+@lru_cache(maxsize=1)
 def get_tqdm_progress_bar():
     try:
         # https://github.com/ASFHyP3/hyp3-sdk/issues/92
@@ -79,6 +97,16 @@ def get_authenticated_session(username: str | None, password: str | None) -> req
         An authenticated HyP3 Session
     """
     s = requests.Session()
+    retry_strategy = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # return the last response once retries are exhausted so it can be raised as a HyP3SDKError
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=_API_POOL_SIZE, max_retries=retry_strategy)
+    s.mount('https://', adapter)
+    s.mount('http://', adapter)
 
     if username is not None and password is not None:
         response = s.get(AUTH_URL, auth=(username, password))
@@ -112,7 +140,9 @@ def get_authenticated_session(username: str | None, password: str | None) -> req
     return s
 
 
-def download_file(url: str, filepath: Path | str, chunk_size=None, retries=2, backoff_factor=1) -> Path:
+def download_file(
+    url: str, filepath: Path | str, chunk_size=1024 * 1024, retries=2, backoff_factor=1, show_progress: bool = True
+) -> Path:
     """Download a file
     Args:
         url: URL of the file to download
@@ -120,29 +150,42 @@ def download_file(url: str, filepath: Path | str, chunk_size=None, retries=2, ba
         chunk_size: Size to chunk the download into
         retries: Number of retries to attempt
         backoff_factor: Factor for calculating time between retries
+        show_progress: Display a progress bar for the download
     Returns:
         download_path: The path to the downloaded file
     """
     filepath = Path(filepath)
+    session = _get_download_session(retries, backoff_factor)
+    with session.get(url, stream=True) as s:
+        s.raise_for_status()
+        total = int(s.headers.get('content-length', 0))
+        tqdm = get_tqdm_progress_bar()
+        with open(filepath, 'wb') as out_file:
+            with tqdm.wrapattr(
+                out_file, 'write', miniters=1, desc=filepath.name, total=total, disable=not show_progress
+            ) as f:
+                written = 0
+                for chunk in s.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+
+        # urllib3<2 does not check that the whole body arrived; content-length only describes unencoded bodies
+        if total and 'content-encoding' not in s.headers and written != total:
+            raise requests.exceptions.ChunkedEncodingError(f'Download of {url} ended after {written} of {total} bytes')
+
+    return filepath
+
+
+@lru_cache
+def _get_download_session(retries: int, backoff_factor: float) -> requests.Session:
+    # reusing one session keeps connections to the download host open across files
     session = requests.Session()
     retry_strategy = Retry(
         total=retries,
         backoff_factor=backoff_factor,
         status_forcelist=[429, 500, 502, 503, 504],
     )
-
-    session.mount('https://', HTTPAdapter(max_retries=retry_strategy))
-    session.mount('http://', HTTPAdapter(max_retries=retry_strategy))
-    stream = False if chunk_size is None else True
-    with session.get(url, stream=stream) as s:
-        s.raise_for_status()
-        tqdm = get_tqdm_progress_bar()
-        with tqdm.wrapattr(
-            open(filepath, 'wb'), 'write', miniters=1, desc=filepath.name, total=int(s.headers.get('content-length', 0))
-        ) as f:
-            for chunk in s.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    f.write(chunk)
-    session.close()
-
-    return filepath
+    adapter = HTTPAdapter(pool_maxsize=_DOWNLOAD_POOL_SIZE, max_retries=retry_strategy)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -1,5 +1,7 @@
 import shutil
+import threading
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import patch
 from uuid import uuid4
@@ -81,3 +83,37 @@ def product_zip(tmp_path_factory, test_data_dir):
     shutil.copy(test_data_dir / 'product.zip', product_file)
 
     return product_file
+
+
+@pytest.fixture
+def local_server():
+    """Serve one canned response to every GET from a real HTTP server.
+
+    Unlike `responses`, requests to this server go through `HTTPAdapter.send`, so urllib3 retries are exercised.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, headers, body = self.server.response  # type: ignore[attr-defined]
+            self.server.request_count += 1  # type: ignore[attr-defined]
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.request_count = 0  # type: ignore[attr-defined]
+
+    def serve(status: int, body: bytes = b'', headers: dict | None = None) -> ThreadingHTTPServer:
+        server.response = (status, headers or {}, body)  # type: ignore[attr-defined]
+        return server
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield serve
+    server.shutdown()
+    server.server_close()
@@ -13,6 +13,14 @@ def test_raise_for_hyp3_status():
         exceptions._raise_for_hyp3_status(response)
     assert 'foo' in str(e)
 
+    response = Response()
+    response.status_code = 403
+    response._content = b'Forbidden'
+
+    with pytest.raises(exceptions.HyP3Error) as e:
+        exceptions._raise_for_hyp3_status(response)
+    assert 'Forbidden' in str(e)
+
     response = Response()
     response.status_code = 500
 
@@ -33,6 +41,14 @@ def test_raise_for_search_status():
         exceptions._raise_for_search_status(response)
     assert 'bar' in str(e)
 
+    response = Response()
+    response.status_code = 400
+    response._content = b'{ "detail" : "baz" }'
+
+    with pytest.raises(exceptions.ASFSearchError) as e:
+        exceptions._raise_for_search_status(response)
+    assert 'baz' in str(e)
+
     response = Response()
     response.status_code = 500
 
@@ -1,12 +1,16 @@
 import math
 import warnings
 from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 from urllib.parse import urljoin
 
+import pytest
+import requests
 import responses
 
 import hyp3_sdk
-from hyp3_sdk import HyP3, Job
+from hyp3_sdk import Batch, HyP3, Job
+from hyp3_sdk.exceptions import HyP3Error, PartialSubmissionError
 
 
 @responses.activate
@@ -22,6 +26,20 @@ def test_session_headers(get_mock_hyp3):
     assert responses.calls[1].request.headers['User-Agent'] == f'hyp3_sdk/{hyp3_sdk.__version__}'
 
 
+@responses.activate
+def test_set_url(get_mock_hyp3, get_mock_job):
+    job = get_mock_job()
+    api = get_mock_hyp3()
+    api._user_info = (0.0, {})
+
+    api.url = hyp3_sdk.TEST_API
+    assert api.url == hyp3_sdk.TEST_API
+    assert api._user_info is None
+
+    responses.add(responses.GET, urljoin(hyp3_sdk.TEST_API, f'/jobs/{job.job_id}'), json=job.to_dict())
+    assert api.get_job_by_id(job.job_id) == job
+
+
 @responses.activate
 def test_find_jobs(get_mock_hyp3, get_mock_job):
     api_response_mock = {
@@ -168,6 +186,79 @@ def test_watch(get_mock_hyp3, get_mock_job):
     responses.assert_call_count(urljoin(api.url, f'/jobs/{incomplete_job.job_id}'), 4)
 
 
+@responses.activate
+def test_watch_max_interval(get_mock_hyp3, get_mock_job):
+    incomplete_job = get_mock_job()
+    complete_job = Job.from_dict(incomplete_job.to_dict())
+    complete_job.status_code = 'SUCCEEDED'
+    api = get_mock_hyp3()
+    for ii in range(4):
+        responses.add(responses.GET, urljoin(api.url, f'/jobs/{incomplete_job.job_id}'), json=incomplete_job.to_dict())
+    responses.add(responses.GET, urljoin(api.url, f'/jobs/{incomplete_job.job_id}'), json=complete_job.to_dict())
+    with patch('time.sleep') as mock_sleep:
+        response = api.watch(incomplete_job, interval=10, max_interval=20)
+    assert response == complete_job
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [10, 15, 20, 20]
+
+
+@responses.activate
+def test_watch_jitter(get_mock_hyp3, get_mock_job):
+    incomplete_job = get_mock_job()
+    complete_job = Job.from_dict(incomplete_job.to_dict())
+    complete_job.status_code = 'SUCCEEDED'
+    api = get_mock_hyp3()
+    for ii in range(2):
+        responses.add(responses.GET, urljoin(api.url, f'/jobs/{incomplete_job.job_id}'), json=incomplete_job.to_dict())
+    responses.add(responses.GET, urljoin(api.url, f'/jobs/{incomplete_job.job_id}'), json=complete_job.to_dict())
+    with patch('time.sleep') as mock_sleep, patch('random.uniform', side_effect=[0.5, 1.5]) as mock_uniform:
+        response = api.watch(incomplete_job, interval=10, jitter=True)
+    assert response == complete_job
+    assert [call.args for call in mock_uniform.call_args_list] == [(0.5, 1.5), (0.5, 1.5)]
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [5, 15]
+
+
+@responses.activate
+def test_watch_batch_max_interval(get_mock_hyp3, get_mock_job):
+    jobs = [get_mock_job(), get_mock_job()]
+    api = get_mock_hyp3()
+
+    statuses = [
+        ('RUNNING', 'RUNNING'),
+        ('RUNNING', 'RUNNING'),
+        ('SUCCEEDED', 'RUNNING'),
+        ('SUCCEEDED', 'RUNNING'),
+        ('SUCCEEDED', 'SUCCEEDED'),
+    ]
+    for status_codes in statuses:
+        for job, status_code in zip(jobs, status_codes):
+            refreshed_job = Job.from_dict(job.to_dict())
+            refreshed_job.status_code = status_code
+            responses.add(responses.GET, urljoin(api.url, f'/jobs/{job.job_id}'), json=refreshed_job.to_dict())
+
+    with patch('time.sleep') as mock_sleep:
+        batch = api.watch(Batch(jobs), interval=10, max_interval=100)
+    assert batch.complete()
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [10, 15, 10, 15]
+
+
+@responses.activate
+def test_watch_batch_skips_complete_jobs(get_mock_hyp3, get_mock_job):
+    complete_job = get_mock_job(status_code='SUCCEEDED')
+    incomplete_job = get_mock_job()
+    refreshed_job = Job.from_dict(incomplete_job.to_dict())
+    refreshed_job.status_code = 'FAILED'
+    api = get_mock_hyp3()
+
+    responses.add(responses.GET, urljoin(api.url, f'/jobs/{complete_job.job_id}'), json=complete_job.to_dict())
+    responses.add(responses.GET, urljoin(api.url, f'/jobs/{incomplete_job.job_id}'), json=incomplete_job.to_dict())
+    responses.add(responses.GET, urljoin(api.url, f'/jobs/{incomplete_job.job_id}'), json=refreshed_job.to_dict())
+
+    batch = api.watch(Batch([complete_job, incomplete_job]), interval=0.05)
+    assert batch.jobs == [complete_job, refreshed_job]
+    responses.assert_call_count(urljoin(api.url, f'/jobs/{incomplete_job.job_id}'), 2)
+    responses.assert_call_count(urljoin(api.url, f'/jobs/{complete_job.job_id}'), 1)
+
+
 @responses.activate
 def test_refresh(get_mock_hyp3, get_mock_job):
     job = get_mock_job()
@@ -181,6 +272,45 @@ def test_refresh(get_mock_hyp3, get_mock_job):
     assert response == new_job
 
 
+@responses.activate
+def test_refresh_batch(get_mock_hyp3, get_mock_job):
+    jobs = [get_mock_job(name=f'job{ii}') for ii in range(20)]
+    new_jobs = [Job.from_dict(job.to_dict()) for job in jobs]
+    for new_job in new_jobs:
+        new_job.status_code = 'SUCCEEDED'
+
+    api = get_mock_hyp3()
+
+    for new_job in new_jobs:
+        responses.add(responses.GET, urljoin(api.url, f'/jobs/{new_job.job_id}'), json=new_job.to_dict())
+    response = api.refresh(Batch(jobs))
+    assert response.jobs == new_jobs
+
+
+@responses.activate
+def test_refresh_batch_duplicate_jobs(get_mock_hyp3, get_mock_job):
+    job = get_mock_job()
+    new_job = Job.from_dict(job.to_dict())
+    new_job.status_code = 'SUCCEEDED'
+
+    api = get_mock_hyp3()
+
+    responses.add(responses.GET, urljoin(api.url, f'/jobs/{job.job_id}'), json=new_job.to_dict())
+    response = api.refresh(Batch([job, job, job]))
+    assert response.jobs == [new_job, new_job, new_job]
+    assert len(responses.calls) == 1
+
+
+def test_watch_refresh_unsupported_type(get_mock_hyp3):
+    api = get_mock_hyp3()
+
+    with pytest.raises(NotImplementedError):
+        api.watch('foo')
+
+    with pytest.raises(NotImplementedError):
+        api.refresh('foo')
+
+
 @responses.activate
 def test_submit_prepared_jobs(get_mock_hyp3, get_mock_job):
     rtc_job = get_mock_job('RTC_GAMMA', job_parameters={'granules': ['g1']})
@@ -200,6 +330,48 @@ def test_submit_prepared_jobs(get_mock_hyp3, get_mock_job):
     assert batch.jobs == [rtc_job, insar_job]
 
 
+@responses.activate
+def test_submit_prepared_jobs_chunked(get_mock_hyp3, get_mock_job):
+    jobs = [get_mock_job('RTC_GAMMA', job_parameters={'granules': [f'g{ii}']}) for ii in range(250)]
+
+    api = get_mock_hyp3()
+
+    responses.add(responses.POST, urljoin(api.url, '/jobs'), json={'jobs': [job.to_dict() for job in jobs[:200]]})
+    responses.add(responses.POST, urljoin(api.url, '/jobs'), json={'jobs': [job.to_dict() for job in jobs[200:]]})
+
+    batch = api.submit_prepared_jobs([job.to_dict(for_resubmit=True) for job in jobs])
+    assert batch.jobs == jobs
+    responses.assert_call_count(urljoin(api.url, '/jobs'), 2)
+
+
+@responses.activate
+def test_submit_prepared_jobs_partial_failure(get_mock_hyp3, get_mock_job):
+    jobs = [get_mock_job('RTC_GAMMA', job_parameters={'granules': [f'g{ii}']}) for ii in range(250)]
+
+    api = get_mock_hyp3()
+    api._user_info = (0.0, {})
+
+    responses.add(responses.POST, urljoin(api.url, '/jobs'), json={'jobs': [job.to_dict() for job in jobs[:200]]})
+    responses.add(responses.POST, urljoin(api.url, '/jobs'), json={'detail': 'insufficient credits'}, status=400)
+
+    with pytest.raises(PartialSubmissionError, match=r'insufficient credits.*Only 200 of 250 jobs') as e:
+        api.submit_prepared_jobs([job.to_dict(for_resubmit=True) for job in jobs])
+    assert e.value.batch.jobs == jobs[:200]
+    assert api._user_info is None
+
+    responses.add(responses.POST, urljoin(api.url, '/jobs'), json={'jobs': [job.to_dict() for job in jobs[:200]]})
+    responses.add(responses.POST, urljoin(api.url, '/jobs'), body=requests.ConnectionError('connection reset'))
+    with pytest.raises(PartialSubmissionError, match=r'connection reset.*Only 200 of 250 jobs') as e:
+        api.submit_prepared_jobs([job.to_dict(for_resubmit=True) for job in jobs])
+    assert e.value.batch.jobs == jobs[:200]
+    assert isinstance(e.value.__cause__, requests.ConnectionError)
+
+    responses.add(responses.POST, urljoin(api.url, '/jobs'), json={'detail': 'insufficient credits'}, status=400)
+    with pytest.raises(HyP3Error) as error:
+        api.submit_prepared_jobs([job.to_dict(for_resubmit=True) for job in jobs[:1]])
+    assert not isinstance(error.value, PartialSubmissionError)
+
+
 def test_prepare_autorift_job():
     assert HyP3.prepare_autorift_job(granule1='my_granule1', granule2='my_granule2') == {
         'job_type': 'AUTORIFT',
@@ -392,6 +564,30 @@ def test_my_info(get_mock_hyp3):
     assert response == api_response
 
 
+@responses.activate
+def test_my_info_ttl(get_mock_hyp3, get_mock_job):
+    api_response = {'job_names': ['name1', 'name2'], 'remaining_credits': 25.0, 'user_id': 'someUser'}
+    api = get_mock_hyp3()
+    responses.add(responses.GET, urljoin(api.url, '/user'), json=api_response)
+
+    assert api.my_info() == api_response
+    assert api.my_info() == api_response
+    responses.assert_call_count(urljoin(api.url, '/user'), 2)
+
+    assert api.my_info(ttl=60) == api_response
+    assert math.isclose(api.check_credits(ttl=60), 25.0)
+    with pytest.warns(DeprecationWarning):
+        assert math.isclose(api.check_quota(ttl=60), 25.0)
+    responses.assert_call_count(urljoin(api.url, '/user'), 2)
+
+    job = get_mock_job()
+    responses.add(responses.POST, urljoin(api.url, '/jobs'), json={'jobs': [job.to_dict()]})
+    api.submit_prepared_jobs(job.to_dict(for_resubmit=True))
+
+    assert api.my_info(ttl=60) == api_response
+    responses.assert_call_count(urljoin(api.url, '/user'), 3)
+
+
 @responses.activate
 def test_check_credits(get_mock_hyp3):
     api_response = {'job_names': ['name1', 'name2'], 'remaining_credits': 25.0, 'user_id': 'someUser'}
@@ -1,12 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 import pytest
 import responses
 from dateutil import tz
 
 from hyp3_sdk.exceptions import HyP3SDKError
-from hyp3_sdk.jobs import Batch, Job
+from hyp3_sdk.jobs import Batch, Job, _parse_datetime
+from hyp3_sdk.util import download_file
 
 
 SUCCEEDED_JOB = {
@@ -50,6 +53,14 @@ FAILED_JOB = {
 }
 
 
+def test_parse_datetime():
+    expected = datetime(2020, 9, 22, 23, 55, 10, tzinfo=tz.UTC)
+    assert _parse_datetime('2020-09-22T23:55:10+00:00') == expected
+    assert _parse_datetime('2020-09-22T23:55:10Z') == expected
+    assert _parse_datetime('2020-09-22T23:55:10.123456+00:00') == expected.replace(microsecond=123456)
+    assert _parse_datetime('Sep 22 2020 23:55:10 UTC') == expected
+
+
 def test_job_attributes():
     job = Job.from_dict(SUCCEEDED_JOB)
     for key in SUCCEEDED_JOB.keys():
@@ -78,6 +89,17 @@ def test_job_dict_transforms():
     assert retry.keys() == Job._attributes_for_resubmit
 
 
+def test_job_eq():
+    job = Job.from_dict(SUCCEEDED_JOB)
+    assert job == Job.from_dict(SUCCEEDED_JOB)
+    assert job != Job.from_dict(FAILED_JOB)
+    assert job != SUCCEEDED_JOB
+
+    other_job = Job.from_dict(SUCCEEDED_JOB)
+    other_job.files = []
+    assert job != other_job
+
+
 def test_job_complete_succeeded_failed_running():
     job = Job.from_dict(SUCCEEDED_JOB)
     assert job.complete()
@@ -373,8 +395,8 @@ def test_batch_download(tmp_path, get_mock_job):
     paths = batch.download_files(tmp_path)
     contents = [path.read_text() for path in paths]
     assert len(paths) == 3
-    assert set(paths) == {tmp_path / 'file1', tmp_path / 'file2', tmp_path / 'file3'}
-    assert set(contents) == {'foobar1', 'foobar2', 'foobar3'}
+    assert paths == [tmp_path / 'file1', tmp_path / 'file2', tmp_path / 'file3']
+    assert contents == ['foobar1', 'foobar2', 'foobar3']
 
     with pytest.raises(NotADirectoryError):
         batch.download_files(tmp_path / 'not_a_dir', create=False)
@@ -390,6 +412,32 @@ def test_batch_download(tmp_path, get_mock_job):
     assert set(contents) == {'foobar1', 'foobar2', 'foobar3'}
 
 
+@responses.activate
+def test_batch_download_max_workers(tmp_path, get_mock_job):
+    expiration_time = (datetime.now(tz=tz.UTC) + timedelta(days=7)).isoformat(timespec='seconds')
+    batch = Batch(
+        [
+            get_mock_job(
+                status_code='SUCCEEDED',
+                expiration_time=expiration_time,
+                files=[{'url': 'https://foo.com/file1', 'size': 0, 'filename': 'file1'}],
+            )
+        ]
+    )
+    responses.add(responses.GET, 'https://foo.com/file1', body='foobar1')
+
+    with patch('hyp3_sdk.jobs.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as mock_executor:
+        batch.download_files(tmp_path, max_workers=64)
+    mock_executor.assert_called_once_with(max_workers=16)
+
+    with patch('hyp3_sdk.jobs.download_file', wraps=download_file) as mock_download_file:
+        batch.download_files(tmp_path, max_workers=1)
+        assert mock_download_file.call_args.kwargs['show_progress'] is True
+
+        batch.download_files(tmp_path)
+        assert mock_download_file.call_args.kwargs['show_progress'] is False
+
+
 @responses.activate
 def test_batch_download_expired(tmp_path, get_mock_job):
     expired_time = (datetime.now(tz=tz.UTC) - timedelta(days=7)).isoformat(timespec='seconds')
@@ -1,4 +1,8 @@
+import gzip
+import importlib
+import json
 import shutil
+import sys
 from pathlib import Path
 
 import pytest
@@ -6,7 +10,7 @@ import requests
 import responses
 
 from hyp3_sdk import util
-from hyp3_sdk.exceptions import AuthenticationError
+from hyp3_sdk.exceptions import AuthenticationError, HyP3Error, ServerError, _raise_for_hyp3_status
 
 
 @responses.activate
@@ -16,6 +20,35 @@ def test_get_authenticated_session():
     assert isinstance(util.get_authenticated_session(None, None), requests.Session)
 
 
+@responses.activate
+def test_get_authenticated_session_adapter():
+    responses.add(responses.GET, util.AUTH_URL, status=200)
+    session = util.get_authenticated_session(None, None)
+
+    adapter = session.get_adapter('https://hyp3-api.asf.alaska.edu')
+    assert adapter._pool_maxsize == 16  # type: ignore [attr-defined]
+    assert adapter.max_retries.total == 5  # type: ignore [attr-defined]
+    assert adapter.max_retries.status_forcelist == [429, 500, 502, 503, 504]  # type: ignore [attr-defined]
+
+
+@responses.activate
+def test_get_authenticated_session_retries_exhausted(local_server, monkeypatch):
+    monkeypatch.setattr('urllib3.util.retry.time.sleep', lambda _: None)
+    responses.add(responses.GET, util.AUTH_URL, status=200)
+    session = util.get_authenticated_session(None, None)
+
+    server = local_server(500)
+    url = f'http://127.0.0.1:{server.server_port}/jobs'
+    responses.add_passthru(url)
+    with pytest.raises(ServerError):
+        _raise_for_hyp3_status(session.get(url))
+    assert server.request_count == 6
+
+    local_server(429, b'{"detail": "Too many requests"}', {'Content-Type': 'application/json'})
+    with pytest.raises(HyP3Error, match=r'Too many requests'):
+        _raise_for_hyp3_status(session.get(url))
+
+
 @responses.activate
 def test_get_authenticated_session_eula():
     redirect_url = (
@@ -78,6 +111,16 @@ def test_download_file(tmp_path):
     assert result_path.read_text() == 'foobar'
 
 
+def test_get_download_session():
+    session = util._get_download_session(2, 1)
+    assert util._get_download_session(2, 1) is session
+    assert util._get_download_session(3, 1) is not session
+
+    adapter = session.get_adapter('https://foo.com')
+    assert adapter._pool_maxsize == 16  # type: ignore [attr-defined]
+    assert adapter.max_retries.total == 2  # type: ignore [attr-defined]
+
+
 @responses.activate
 def test_download_file_string_format(tmp_path):
     responses.add(responses.GET, 'https://foo.com/file2', body='foobar2')
@@ -95,6 +138,44 @@ def test_download_file_chunked_response(tmp_path):
     assert result_path.read_text() == 'foobar3'
 
 
+@responses.activate
+def test_download_file_encoded_response(tmp_path):
+    responses.add(
+        responses.GET,
+        'https://foo.com/file4',
+        body=gzip.compress(b'foobar4'),
+        headers={'Content-Encoding': 'gzip'},
+    )
+    result_path = util.download_file('https://foo.com/file4', tmp_path / 'file4')
+    assert result_path.read_text() == 'foobar4'
+
+
+def test_download_file_truncated_response(tmp_path, local_server):
+    server = local_server(200, b'foo', {'Content-Length': '10'})
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        util.download_file(f'http://127.0.0.1:{server.server_port}/file6', tmp_path / 'file6')
+
+
+def test_load_json():
+    response = requests.Response()
+    response._content = b'{"jobs": [{"job_id": "foo"}], "next": null}'
+    assert util._load_json(response) == {'jobs': [{'job_id': 'foo'}], 'next': None}
+
+
+def test_load_json_stdlib_fallback(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'orjson', None)
+    try:
+        importlib.reload(util)
+        assert util._json is json
+
+        response = requests.Response()
+        response._content = b'{"jobs": [{"job_id": "foo"}], "next": null}'
+        assert util._load_json(response) == {'jobs': [{'job_id': 'foo'}], 'next': None}
+    finally:
+        monkeypatch.undo()
+        importlib.reload(util)
+
+
 def test_chunk():
     items = list(range(1234))
     chunks = list(util.chunk(items))